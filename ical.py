@@ -10,23 +10,90 @@ Usage:
     python outlook_calendar_extractor.py --url "https://outlook.live.com/owa/calendar/shared_calendar_url" [--output weekly_calendar.md]
 
 Requirements:
-    pip install requests icalendar pandas python-dateutil
+    pip install requests icalendar python-dateutil
 """
 
 import argparse
+from array import array
 import datetime
+import functools
+import re
 import sys
-import os
+from collections import namedtuple
+from dataclasses import dataclass, field
+from pathlib import Path
 import requests
 from icalendar import Calendar
 from dateutil.relativedelta import relativedelta
 from dateutil.rrule import rrulestr
 from dateutil.parser import parse
-import pandas as pd
 
-def get_current_week_range():
-    """Get the start and end dates for the current week (Monday to Sunday)."""
-    today = datetime.datetime.now().date()
+_UTC = datetime.timezone.utc
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+# Shared session so repeated fetches reuse pooled connections
+_SESSION = requests.Session()
+_UNTIL_RE = re.compile(r'UNTIL=([0-9TZ]+)')
+_COUNT_RE = re.compile(r'COUNT=([0-9]+)')
+_FREQ_RE = re.compile(r'FREQ=([A-Z]+)')
+_INTERVAL_RE = re.compile(r'INTERVAL=([0-9]+)')
+# Frequencies whose instances are exactly one period apart when no BYxxx parts are given
+# (MONTHLY/YEARLY skip invalid dates such as Feb 30, so they have no fixed period)
+_FIXED_PERIODS = {
+    'SECONDLY': datetime.timedelta(seconds=1),
+    'MINUTELY': datetime.timedelta(minutes=1),
+    'HOURLY': datetime.timedelta(hours=1),
+    'DAILY': datetime.timedelta(days=1),
+    'WEEKLY': datetime.timedelta(weeks=1),
+}
+# Meeting invite boilerplate; descriptions are cut at the first marker found
+_TRUNC_RE = re.compile(r"Join Microsoft Teams Meeting|Join Zoom Meeting|Sie wurden zu einem Zoom-Meeting eingeladen")
+
+def _to_utc(dt):
+    """Return dt as a timezone-aware datetime, treating naive values and dates as UTC."""
+    # Exact class check first: the common case is an already aware datetime
+    if dt.__class__ is datetime.datetime or isinstance(dt, datetime.datetime):
+        return dt if dt.tzinfo is not None else dt.replace(tzinfo=_UTC)
+    return datetime.datetime(dt.year, dt.month, dt.day, tzinfo=_UTC)
+
+def _rrule_until(rrule_str):
+    """Return the UNTIL of a recurrence rule as an aware datetime, or None."""
+    match = _UNTIL_RE.search(rrule_str)
+    if not match:
+        return None
+    value = match.group(1).rstrip('Z')
+    fmt = '%Y%m%dT%H%M%S' if 'T' in value else '%Y%m%d'
+    try:
+        until = datetime.datetime.strptime(value, fmt)
+    except ValueError:
+        return None
+    if fmt == '%Y%m%d':
+        # Date-only UNTIL is inclusive of the whole day
+        until = datetime.datetime.combine(until.date(), datetime.time.max)
+    return until.replace(tzinfo=_UTC)
+
+def _rrule_count_end(rrule_str, dtstart):
+    """Return the last instance of a COUNT-bounded rule with a fixed period, or None."""
+    match = _COUNT_RE.search(rrule_str)
+    if not match or 'BY' in rrule_str:
+        return None
+    freq = _FREQ_RE.search(rrule_str)
+    period = _FIXED_PERIODS.get(freq.group(1)) if freq else None
+    if period is None:
+        return None
+    interval = _INTERVAL_RE.search(rrule_str)
+    steps = (int(match.group(1)) - 1) * (int(interval.group(1)) if interval else 1)
+    return dtstart + steps * period
+
+@functools.lru_cache(maxsize=4)
+def _parse_cal(ical_data):
+    """Parse iCalendar data, caching the result for repeated runs on the same data."""
+    return Calendar.from_ical(ical_data)
+
+def get_current_week_range(now):
+    """Get the start and end dates for the week (Monday to Sunday) containing now."""
+    today = now.date()
     start_of_week = today - datetime.timedelta(days=today.weekday())  # Monday
     end_of_week = start_of_week + datetime.timedelta(days=6)  # Sunday
     
@@ -41,137 +108,181 @@ def get_current_week_range():
     return start_datetime, end_datetime
 
 def fetch_calendar(url):
-    """Fetch the iCalendar file from the given URL."""
+    """Fetch the iCalendar file from the given URL as raw bytes."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
+        response = _SESSION.get(url, headers=_HEADERS, timeout=15)
         response.raise_for_status()
-        return response.text
+        # icalendar parses bytes directly, so skip decoding to text
+        return response.content
     except requests.exceptions.RequestException as e:
         print(f"Error fetching calendar: {e}", file=sys.stderr)
         sys.exit(1)
 
+def _prop_dates(prop, tzinfo):
+    """Return the datetimes of an EXDATE/RDATE property (single or repeated) as wall times in tzinfo, labelled UTC."""
+    if not prop:
+        return []
+    props = prop if isinstance(prop, list) else [prop]
+    dates = []
+    for date_list in props:
+        for value in date_list.dts:
+            dt = value.dt
+            if isinstance(dt, tuple):
+                # RDATE periods: only the start matters for the recurrence set
+                dt = dt[0]
+            # Match the DTSTART written into the rule string, which keeps the wall time
+            if isinstance(dt, datetime.datetime) and dt.tzinfo is not None:
+                dt = dt.astimezone(tzinfo)
+            dates.append(_to_utc(dt).replace(tzinfo=_UTC))
+    return dates
+
+def _compute_duration(dtstart_prop, dtend_prop):
+    """Return the DTEND - DTSTART duration of timed events, or None."""
+    if not dtend_prop:
+        return None
+    original_start = dtstart_prop.dt
+    original_end = dtend_prop.dt
+    if isinstance(original_start, datetime.datetime) and isinstance(original_end, datetime.datetime):
+        # A naive (floating) side borrows its partner's timezone
+        if original_start.tzinfo is None and original_end.tzinfo is not None:
+            original_start = original_start.replace(tzinfo=original_end.tzinfo)
+        elif original_start.tzinfo is not None and original_end.tzinfo is None:
+            original_end = original_end.replace(tzinfo=original_start.tzinfo)
+        return original_end - original_start
+    return None
+
+def _indices_in_range(starts, ends, lo, hi):
+    """Return indices of events whose start or end epoch lies in [lo, hi] (an end of 0 means none)."""
+    return [i for i, (s, e) in enumerate(zip(starts, ends)) if lo <= s <= hi or (e != 0 and lo <= e <= hi)]
+
+@dataclass
+class Events:
+    """Extracted events in columnar form: row i of every column describes one event."""
+    starts: list = field(default_factory=list)
+    ends: list = field(default_factory=list)
+    all_day: list = field(default_factory=list)
+    summaries: list = field(default_factory=list)
+    descriptions: list = field(default_factory=list)
+    locations: list = field(default_factory=list)
+    organizers: list = field(default_factory=list)
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def append(self, component, event_start, event_end, all_day):
+        """Add a row for a VEVENT and its (instance) start and end."""
+        self.starts.append(event_start)
+        self.ends.append(event_end)
+        self.all_day.append(all_day)
+        self.summaries.append(str(component.get('summary', 'No Title')))
+        self.descriptions.append(str(component.get('description', '')))
+        self.locations.append(str(component.get('location', '')))
+        self.organizers.append(str(component.get('organizer', '')))
+
+# One formatted event row; start_dt keeps the raw start for grouping by day
+Formatted = namedtuple('Formatted', 'summary start end location organizer description all_day start_dt')
+
 def parse_ical_data(ical_data, start_date, end_date):
     """Parse iCalendar data and extract events for the current week."""
-    events = []
+    events = Events()
+    start_date = _to_utc(start_date)
+    end_date = _to_utc(end_date)
+    
+    # Rows as (component, start, end, all_day, one-off index or -1) in calendar order;
+    # one-off events are filtered on their epoch columns after the walk
+    rows = []
+    single_starts = array('d')
+    single_ends = array('d')
     
     try:
-        calendar = Calendar.from_ical(ical_data)
+        calendar = _parse_cal(ical_data)
         
-        for component in calendar.walk():
-            if component.name == "VEVENT":
-                # Extract event details
-                summary = str(component.get('summary', 'No Title'))
-                description = str(component.get('description', ''))
-                location = str(component.get('location', ''))
-                organizer = str(component.get('organizer', ''))
+        # Only VEVENTs carry events; VTIMEZONE and friends are skipped by walk()
+        for component in calendar.walk('VEVENT'):
+            dtstart_prop = component.get('dtstart')
+            dtend_prop = component.get('dtend')
+            rrule_prop = component.get('rrule')
+            
+            # Handle recurring events
+            if rrule_prop:
+                # Extract recurrence rule
+                rrule_str = rrule_prop.to_ical().decode('utf-8')
+                dtstart = _to_utc(dtstart_prop.dt)
                 
-                # Handle recurring events
-                if component.get('rrule'):
-                    # Extract recurrence rule
-                    rrule_str = component.get('rrule').to_ical().decode('utf-8')
-                    dtstart = component.get('dtstart').dt
-                    
-                    # Convert to UTC if it's a datetime
-                    if isinstance(dtstart, datetime.datetime):
-                        if dtstart.tzinfo is None:
-                            dtstart = dtstart.replace(tzinfo=datetime.timezone.utc)
-                    
-                    # Create a string representation of the rule
-                    rrule_string = f"DTSTART:{dtstart.strftime('%Y%m%dT%H%M%SZ')}\n{rrule_str}"
-                    
-                    # Make sure start_date and end_date have the same timezone awareness as dtstart
-                    start_date_aware = start_date
-                    end_date_aware = end_date
-                    if isinstance(dtstart, datetime.datetime) and dtstart.tzinfo is not None:
-                        if start_date.tzinfo is None:
-                            start_date_aware = start_date.replace(tzinfo=datetime.timezone.utc)
-                        if end_date.tzinfo is None:
-                            end_date_aware = end_date.replace(tzinfo=datetime.timezone.utc)
-                    
-                    # Get recurring instances in the current week
-                    try:
-                        rule = rrulestr(rrule_string, forceset=True)
-                        instances = rule.between(start_date_aware, end_date_aware, inc=True)
-                        
-                        for instance in instances:
-                            event_start = instance
-                            
-                            # Calculate event duration
-                            duration = None
-                            if component.get('dtend'):
-                                original_start = component.get('dtstart').dt
-                                original_end = component.get('dtend').dt
-                                if isinstance(original_start, datetime.datetime) and isinstance(original_end, datetime.datetime):
-                                    # Ensure both have same timezone awareness
-                                    if original_start.tzinfo is None and original_end.tzinfo is not None:
-                                        original_start = original_start.replace(tzinfo=original_end.tzinfo)
-                                    elif original_start.tzinfo is not None and original_end.tzinfo is None:
-                                        original_end = original_end.replace(tzinfo=original_start.tzinfo)
-                                    duration = original_end - original_start
-                            
-                            # Calculate end time
-                            event_end = None
-                            if duration:
-                                event_end = event_start + duration
-                            
-                            events.append({
-                                'summary': summary,
-                                'description': description,
-                                'location': location,
-                                'organizer': organizer,
-                                'start': event_start,
-                                'end': event_end,
-                                'all_day': False
-                            })
-                    except Exception as e:
-                        print(f"Error processing recurring event: {e}", file=sys.stderr)
+                # The rule string below keeps DTSTART's wall time but labels it UTC,
+                # so the early checks have to compare in that same frame
+                dtstart_rule = dtstart.replace(tzinfo=_UTC)
                 
-                # Handle regular events
-                else:
-                    event_start = component.get('dtstart').dt
-                    event_end = component.get('dtend').dt if component.get('dtend') else None
-                    
-                    # Handle all-day events
-                    all_day = False
-                    if isinstance(event_start, datetime.date) and not isinstance(event_start, datetime.datetime):
-                        all_day = True
-                        # Convert to datetime for easier comparison
-                        event_start = datetime.datetime.combine(event_start, datetime.time.min)
-                        if event_end:
-                            event_end = datetime.datetime.combine(event_end, datetime.time.min)
-                    
-                    # Ensure timezone awareness
-                    if isinstance(event_start, datetime.datetime) and event_start.tzinfo is None:
-                        event_start = event_start.replace(tzinfo=datetime.timezone.utc)
-                    if event_end and isinstance(event_end, datetime.datetime) and event_end.tzinfo is None:
-                        event_end = event_end.replace(tzinfo=datetime.timezone.utc)
-                    
-                    # Ensure all datetimes have timezone info for comparison
-                    event_start_compare = event_start
-                    event_end_compare = event_end
+                # RDATEs add occurrences regardless of UNTIL/COUNT and DTSTART
+                rdate_prop = component.get('rdate')
+                
+                # Skip series that ended before or start after the week
+                # without building and iterating the rrule
+                if not rdate_prop:
+                    until = _rrule_until(rrule_str)
+                    if until is not None and until < start_date:
+                        continue
+                    last = _rrule_count_end(rrule_str, dtstart_rule)
+                    if last is not None and last < start_date:
+                        continue
+                    if dtstart_rule > end_date:
+                        continue
+                
+                # Create a string representation of the rule
+                rrule_string = f"DTSTART:{dtstart.strftime('%Y%m%dT%H%M%SZ')}\n{rrule_str}"
+                
+                # Only build an rruleset when there are dates or rules to merge in
+                exdate_prop = component.get('exdate')
+                exrule_prop = component.get('exrule')
+                has_extras = bool(exdate_prop or rdate_prop or exrule_prop)
+                # Aware EXDATE/RDATE values are converted into DTSTART's zone (UTC when floating)
+                dtstart_tz = getattr(dtstart_prop.dt, 'tzinfo', None) or _UTC
+                
+                # Get recurring instances in the current week
+                try:
+                    if exrule_prop:
+                        exrules = exrule_prop if isinstance(exrule_prop, list) else [exrule_prop]
+                        for exrule in exrules:
+                            rrule_string += f"\nEXRULE:{exrule.to_ical().decode('utf-8')}"
                     
-                    if isinstance(event_start, datetime.datetime):
-                        if event_start.tzinfo is None:
-                            event_start_compare = event_start.replace(tzinfo=datetime.timezone.utc)
+                    rule = rrulestr(rrule_string, forceset=has_extras)
+                    for exdate in _prop_dates(exdate_prop, dtstart_tz):
+                        rule.exdate(exdate)
+                    for rdate in _prop_dates(rdate_prop, dtstart_tz):
+                        rule.rdate(rdate)
+                    instances = rule.between(start_date, end_date, inc=True)
                     
-                    if event_end and isinstance(event_end, datetime.datetime):
-                        if event_end.tzinfo is None:
-                            event_end_compare = event_end.replace(tzinfo=datetime.timezone.utc)
+                    # Event duration is the same for every instance
+                    duration = _compute_duration(dtstart_prop, dtend_prop)
                     
-                    # Check if event is in the current week
-                    if start_date <= event_start_compare <= end_date or (event_end_compare and start_date <= event_end_compare <= end_date):
-                        events.append({
-                            'summary': summary,
-                            'description': description,
-                            'location': location,
-                            'organizer': organizer,
-                            'start': event_start,
-                            'end': event_end,
-                            'all_day': all_day
-                        })
+                    for instance in instances:
+                        event_end = instance + duration if duration else None
+                        rows.append((component, instance, event_end, False, -1))
+                except Exception as e:
+                    print(f"Error processing recurring event: {e}", file=sys.stderr)
+            
+            # Collect regular events for the epoch filter below
+            else:
+                event_start = dtstart_prop.dt
+                event_end = dtend_prop.dt if dtend_prop else None
+                
+                # All-day events carry plain dates rather than datetimes
+                all_day = not isinstance(event_start, datetime.datetime)
+                
+                # Normalize to aware datetimes for comparison
+                event_start = _to_utc(event_start)
+                if event_end:
+                    event_end = _to_utc(event_end)
+                
+                rows.append((component, event_start, event_end, all_day, len(single_starts)))
+                single_starts.append(event_start.timestamp())
+                single_ends.append(event_end.timestamp() if event_end else 0.0)
+        
+        # Check which one-off events are in the current week on plain epoch numbers
+        in_week = set(_indices_in_range(single_starts, single_ends, start_date.timestamp(), end_date.timestamp()))
+        for component, event_start, event_end, all_day, single in rows:
+            if single < 0 or single in in_week:
+                events.append(component, event_start, event_end, all_day)
                     
     except Exception as e:
         print(f"Error parsing calendar: {e}", file=sys.stderr)
@@ -183,140 +294,129 @@ def format_events(events):
     """Format events for display and export."""
     formatted_events = []
     
-    for event in events:
-        # Format date and time
-        start_str = event['start'].strftime('%Y-%m-%d %H:%M') if event['start'] else 'N/A'
-        end_str = event['end'].strftime('%Y-%m-%d %H:%M') if event['end'] else 'N/A'
+    for i in range(len(events)):
+        start = events.starts[i]
+        end = events.ends[i]
+        all_day = events.all_day[i]
+        
+        # Format date and time ('YYYY-MM-DD HH:MM', the date being the first 10 chars)
+        start_iso = start.isoformat(sep=' ', timespec='minutes')[:16] if start else None
+        end_iso = end.isoformat(sep=' ', timespec='minutes')[:16] if end else None
         
         # Format all-day events
-        if event.get('all_day', False):
-            start_str = event['start'].strftime('%Y-%m-%d') + ' (All day)'
-            end_str = event['end'].strftime('%Y-%m-%d') + ' (All day)' if event['end'] else 'N/A'
+        if all_day:
+            start_str = f"{start_iso[:10]} (All day)"
+            end_str = f"{end_iso[:10]} (All day)" if end_iso else 'N/A'
+        else:
+            start_str = start_iso or 'N/A'
+            end_str = end_iso or 'N/A'
         
         # Extract email from organizer
-        organizer = event['organizer']
+        organizer = events.organizers[i]
         if 'MAILTO:' in organizer:
             organizer = organizer.split('MAILTO:')[1].strip()
         
-        formatted_events.append({
-            'Summary': event['summary'],
-            'Start': start_str,
-            'End': end_str,
-            'Location': event['location'],
-            'Organizer': organizer,
-            'Description': event['description']
-        })
+        formatted_events.append(Formatted(
+            summary=events.summaries[i],
+            start=start_str,
+            end=end_str,
+            location=events.locations[i],
+            organizer=organizer,
+            description=events.descriptions[i],
+            all_day=all_day,
+            start_dt=start
+        ))
     
     return formatted_events
 
-def save_to_markdown(events, output_file):
-    """Save events to a Markdown file."""
+def save_to_markdown(events, output_file, week_start, week_end, now):
+    """Save events to a Markdown file, titled with the week_start - week_end dates, and return its content."""
     if not events:
         print("No events found for the current week.")
         return
     
     try:
-        # Get current week date range for the title
-        today = datetime.datetime.now().date()
-        start_of_week = today - datetime.timedelta(days=today.weekday())
-        end_of_week = start_of_week + datetime.timedelta(days=6)
-        week_range = f"{start_of_week.strftime('%B %d')} - {end_of_week.strftime('%B %d, %Y')}"
+        # Week date range for the title
+        week_range = f"{week_start.strftime('%B %d')} - {week_end.strftime('%B %d, %Y')}"
         
-        with open(output_file, 'w', encoding='utf-8') as md_file:
-            # Write header
-            md_file.write(f"# Calendar Events: {week_range}\n\n")
+        # Header
+        parts = [f"# Calendar Events: {week_range}\n\n"]
+        
+        # Group events by day
+        events_by_day = {}
+        for event in events:
+            events_by_day.setdefault(event.start_dt.date(), []).append(event)
+        
+        # Events for each day
+        for day in sorted(events_by_day):
+            parts.append(f"## {day.strftime('%A, %B %d')}\n\n")
             
-            # Group events by day
-            events_by_day = {}
-            for event in events:
-                # Extract date from the 'Start' field
-                if ' (All day)' in event['Start']:
-                    date_str = event['Start'].split(' (All day)')[0]
+            # Write events for this day
+            for event in events_by_day[day]:
+                # Format time (start/end are 'YYYY-MM-DD HH:MM')
+                if event.all_day:
+                    time_str = "All day"
                 else:
-                    date_str = event['Start'].split(' ')[0]
+                    end_time = event.end[11:] if event.end != 'N/A' else 'N/A'
+                    time_str = f"{event.start[11:]} - {end_time}"
                 
-                if date_str not in events_by_day:
-                    events_by_day[date_str] = []
+                # Write event details
+                parts.append(f"### {event.summary}\n\n**Time:** {time_str}\n\n")
                 
-                events_by_day[date_str].append(event)
-            
-            # Sort days
-            sorted_days = sorted(events_by_day.keys())
-            
-            # Write events for each day
-            for day in sorted_days:
-                # Convert to datetime to get day name
-                day_dt = datetime.datetime.strptime(day, '%Y-%m-%d').date()
-                day_name = day_dt.strftime('%A')
+                if event.location:
+                    parts.append(f"**Location:** {event.location}\n\n")
                 
-                md_file.write(f"## {day_name}, {day_dt.strftime('%B %d')}\n\n")
+                if event.organizer:
+                    parts.append(f"**Organizer:** {event.organizer}\n\n")
                 
-                # Write events for this day
-                for event in events_by_day[day]:
-                    # Format time
-                    if ' (All day)' in event['Start']:
-                        time_str = "All day"
-                    else:
-                        start_time = event['Start'].split(' ')[1]
-                        end_time = event['End'].split(' ')[1] if event['End'] != 'N/A' else 'N/A'
-                        time_str = f"{start_time} - {end_time}"
-                    
-                    # Write event details
-                    md_file.write(f"### {event['Summary']}\n\n")
-                    md_file.write(f"**Time:** {time_str}\n\n")
-                    
-                    if event['Location'] and event['Location'] != '':
-                        md_file.write(f"**Location:** {event['Location']}\n\n")
-                    
-                    if event['Organizer'] and event['Organizer'] != '':
-                        md_file.write(f"**Organizer:** {event['Organizer']}\n\n")
-                    
-                    if 'Description' in event and event['Description'] and event['Description'] != '':
-                        md_file.write("**Details:**\n\n")
-                        # Indent the description
-                        # cut details when you read "Join Microsoft Teams Meeting"
-                        # or "Join Zoom Meeting"
-                        # or "Sie wurden zu einem Zoom-Meeting eingeladen"
-
-                        if "Join Microsoft Teams Meeting" in event['Description']:
-                            event['Description'] = event['Description'].split("Join Microsoft Teams Meeting")[0]
-                        elif "Join Zoom Meeting" in event['Description']:
-                            event['Description'] = event['Description'].split("Join Zoom Meeting")[0]
-                        elif "Sie wurden zu einem Zoom-Meeting eingeladen" in event['Description']:
-                            event['Description'] = event['Description'].split("Sie wurden zu einem Zoom-Meeting eingeladen")[0]
+                if event.description:
+                    parts.append("**Details:**\n\n")
+                    # Indent the description
+                    # cut details when you read "Join Microsoft Teams Meeting"
+                    # or "Join Zoom Meeting"
+                    # or "Sie wurden zu einem Zoom-Meeting eingeladen"
+                    description = _TRUNC_RE.split(event.description, maxsplit=1)[0]
 
-                        description_lines = event['Description'].split('\n')
-                        indented_description = '\n'.join(['    ' + line for line in description_lines])
-                        md_file.write(f"{indented_description}\n\n")
-                    
-                    md_file.write("---\n\n")  # Add separator between events
-            
-            # Add footer with generation info
-            md_file.write(f"\n\n_Generated on {datetime.datetime.now().strftime('%Y-%m-%d at %H:%M')} · {len(events)} events_")
-            
+                    indented_description = '    ' + description.replace('\n', '\n    ')
+                    parts.append(f"{indented_description}\n\n")
+                
+                parts.append("---\n\n")  # Add separator between events
+        
+        # Add footer with generation info
+        parts.append(f"\n\n_Generated on {now.strftime('%Y-%m-%d at %H:%M')} · {len(events)} events_")
+        
+        content = ''.join(parts)
+        Path(output_file).write_text(content, encoding='utf-8')
         print(f"Events saved to {output_file}")
+        return content
         
     except Exception as e:
         print(f"Error saving to Markdown: {e}", file=sys.stderr)
         sys.exit(1)
 
+def _format_table(rows, columns):
+    """Format rows (namedtuples) as a plain-text table with left-aligned, title-cased columns."""
+    headers = [column.title() for column in columns]
+    cells = [[str(getattr(row, column)) for column in columns] for row in rows]
+    widths = [max([len(header)] + [len(line[j]) for line in cells]) for j, header in enumerate(headers)]
+    lines = ['  '.join(header.ljust(width) for header, width in zip(headers, widths))]
+    for line in cells:
+        lines.append('  '.join(cell.ljust(width) for cell, width in zip(line, widths)))
+    return '\n'.join(line.rstrip() for line in lines)
+
 def display_events(events):
     """Display events in a formatted table."""
     if not events:
         print("No events found for the current week.")
         return
     
-    # Create DataFrame for pretty printing
-    df = pd.DataFrame(events)
-    
     # Reorder columns for better display
-    columns_order = ['Summary', 'Start', 'End', 'Location', 'Organizer']
-    df = df[columns_order]
+    columns_order = ['summary', 'start', 'end', 'location', 'organizer']
     
     # Print the table
     print("\nCurrent Week's Events:")
     print("=====================")
-    print(df.to_string(index=False))
+    print(_format_table(events, columns_order))
     print(f"\nTotal events: {len(events)}")
 
 def main():
@@ -328,11 +428,14 @@ def main():
     parser.add_argument('--stdout', action='store_true', help='Output markdown to stdout')
     args = parser.parse_args()
     
+    # Single timestamp for the whole run, so the week and the footer agree
+    now = datetime.datetime.now()
+    
     print("Fetching calendar data...", file=sys.stderr)
     calendar_data = fetch_calendar(args.url)
     
     print("Determining current week...", file=sys.stderr)
-    start_date, end_date = get_current_week_range()
+    start_date, end_date = get_current_week_range(now)
     print(f"Current week: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}", file=sys.stderr)
     
     print("Extracting events...")
@@ -345,18 +448,16 @@ def main():
     # display_events(formatted_events)
     
     # Save to Markdown
-    save_to_markdown(formatted_events, args.output)
+    content = save_to_markdown(formatted_events, args.output, start_date.date(), end_date.date(), now)
 
-    if not os.path.exists(args.output):
-        print(f"Output file {args.output} does not exist.", file=sys.stderr)
+    # Nothing is written when there are no events; a file left from an earlier run must not be reused
+    if content is None:
+        print(f"Output file {args.output} was not written.", file=sys.stderr)
         sys.exit(1)
 
     # Print the markdown file to stdout if --stdout flag is set
     if args.stdout:
-        with open(args.output, 'r', encoding='utf-8') as md_file:
-            content = md_file.read()
-            print(content)
-            md_file.close()
+        print(content)
     else:
         print(f"No output to stdout selected", sys.stderr)
     